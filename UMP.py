@@ -3,12 +3,20 @@ import sys
 import json
 import platform
 import random
+import math
+import functools
+import collections
+import threading
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+import pyfftw
+from numba import njit, types
 from datetime import datetime, timedelta
 from pathlib import Path
 from PyQt5.QtCore import (Qt, QUrl, QTimer, QSize, QPoint, QRect, QSettings, 
                          QStandardPaths, QFileInfo, QByteArray, QBuffer, QIODevice,
-                         QThread, pyqtSignal, QMutex, QLibraryInfo, QTranslator)
+                         QThread, pyqtSignal, QLibraryInfo, QTranslator)
 from PyQt5.QtGui import (QIcon, QPalette, QColor, QLinearGradient, QPainter, 
                          QBrush, QPixmap, QImage, QFont, QFontMetrics, QKeySequence,
                          QGuiApplication, QClipboard)
@@ -35,73 +43,170 @@ import youtube_dl
 import cdrom
 import eyed3
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
 ## Constants
 SUPPORTED_AUDIO_FORMATS = ['.mp3', '.wav', '.ogg', '.flac', '.m4a', '.aac', '.wma']
 SUPPORTED_VIDEO_FORMATS = ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv']
 SUPPORTED_FORMATS = SUPPORTED_AUDIO_FORMATS + SUPPORTED_VIDEO_FORMATS
+SUPPORTED_FORMAT_SET = frozenset(SUPPORTED_FORMATS)
 THEMES = ['Dark', 'Light', 'Blue', 'Green', 'Red', 'Purple', 'Professional', 'Midnight']
+METADATA_WORKERS = 8
+PLAYLIST_WORKERS = 2
+METADATA_CACHE_SIZE = 4096
+LYRICS_TIMEOUT = 5  # seconds
+MAX_RECENT_FILES = 10
 VISUALIZATION_MODES = ['Waveform', 'Spectrum', 'Spectrogram', 'Bars', 'Particles', 'Fire', 'Water']
 
+## Analysis Kernels
+@functools.lru_cache(maxsize=8)
+def hann_window(size):
+    # Shared between analyzers, so it is handed out read-only
+    window = np.hanning(size).astype(np.float32)
+    window.flags.writeable = False
+    return window
+
+# Compiled once and cached on disk; nogil lets the analyzer thread run them
+# without holding the GIL against the UI thread
+#
+# write_to_ring runs inside process_audio, a slot on the UI thread, so it is
+# compiled eagerly at import from an explicit signature instead of lazily on
+# the first probed buffer. The probe samples are typed read-only and possibly
+# unaligned, which writable, aligned arrays also convert to.
+@njit(types.void(types.Array(types.int16, 1, 'C', readonly=True, aligned=False),
+                 types.float32, types.float32[::1], types.int64, types.int64),
+      fastmath=True, cache=True, nogil=True, boundscheck=False)
+def write_to_ring(samples, scale, ring, start, mask):
+    for i in range(samples.size):
+        ring[(start + i) & mask] = samples[i] * scale
+
+@njit(fastmath=True, cache=True, nogil=True, boundscheck=False)
+def window_from_ring(ring, start, mask, window, out):
+    # Gathers across the wrap point directly, so no frame copy is needed
+    for i in range(out.size):
+        out[i] = ring[(start + i) & mask] * window[i]
+
+@njit(fastmath=True, cache=True, nogil=True, boundscheck=False)
+def magnitude_and_power(spectrum, scale, mag_out, power_out):
+    for i in range(mag_out.size):
+        magnitude = abs(spectrum[i]) * scale
+        mag_out[i] = magnitude
+        power_out[i] = 20.0 * math.log10(magnitude + 1e-12)
+
 ## Utility Classes
+AnalysisResult = collections.namedtuple('AnalysisResult', 'spectrum spectrogram rms peak')
+
 class AudioAnalyzer(QThread):
     analysis_updated = pyqtSignal(object)
+    INT16_SCALE = np.float32(1.0 / 32768.0)
     
     def __init__(self):
         super().__init__()
         self.sample_rate = 44100
         self.fft_size = 2048
         self.history_size = 20
-        self.freq_history = np.zeros((self.history_size, self.fft_size // 2))
-        self.spec_history = np.zeros((self.history_size, self.fft_size // 2))
+        self.freq_bins = self.fft_size // 2 + 1
+        self.freq_history = np.zeros((self.history_size, self.freq_bins), dtype=np.float32)
+        self.spec_history = np.zeros_like(self.freq_history)
+        # Running column sums of the histories for O(bins) smoothing
+        self.freq_sum = np.zeros(self.freq_bins, dtype=np.float32)
+        self.spec_sum = np.zeros(self.freq_bins, dtype=np.float32)
         self.current_pos = 0
-        self.audio_buffer = np.zeros(self.fft_size * 2)
-        self.buffer_pos = 0
-        self.window = np.hanning(self.fft_size)
-        self.mutex = QMutex()
+        # Power-of-two single-producer/single-consumer ring. process_audio only
+        # moves write_pos and run only moves read_pos, each published after its
+        # data access, so plain int assignment under the GIL replaces a lock.
+        self.ring_size = 8192
+        self.ring_mask = self.ring_size - 1
+        self.ring = np.zeros(self.ring_size, dtype=np.float32)
+        self.read_pos = 0
+        self.write_pos = 0
+        self.window = hann_window(self.fft_size)
+        # Persistent FFTW plan over aligned buffers; the window is applied
+        # straight into fft_in and each call writes the spectrum to fft_out
+        self.fft_in = pyfftw.empty_aligned(self.fft_size, dtype='float32')
+        self.fft_out = pyfftw.empty_aligned(self.freq_bins, dtype='complex64')
+        self.fft_plan = pyfftw.FFTW(self.fft_in, self.fft_out, direction='FFTW_FORWARD',
+                                    flags=('FFTW_MEASURE', 'FFTW_DESTROY_INPUT'), threads=2)
+        self.inv_fft_size = np.float32(1.0 / self.fft_size)
+        self.inv_history_size = np.float32(1.0 / self.history_size)
+        # Scratch buffers reused every frame to avoid per-frame temporaries
+        self.mag_scratch = np.empty(self.freq_bins, dtype=np.float32)
+        self.power_scratch = np.empty(self.freq_bins, dtype=np.float32)
         self.running = True
+        # The thread lives for the whole session; playback only pauses it
+        self.paused = True
+        self.wake_event = threading.Event()
         
     def run(self):
         while self.running:
-            self.mutex.lock()
-            if self.buffer_pos >= self.fft_size:
-                chunk = self.audio_buffer[:self.fft_size]
-                self.audio_buffer = np.roll(self.audio_buffer, -self.fft_size)
-                self.buffer_pos -= self.fft_size
+            if self.paused:
+                self.wake_event.wait()
+                self.wake_event.clear()
+                continue
+            if (self.write_pos - self.read_pos) & self.ring_mask < self.fft_size:
+                # Sleep until process_audio publishes a full frame; the state is
+                # re-checked after every wake, the timeout is only a safety net
+                self.wake_event.wait(timeout=0.1)
+                self.wake_event.clear()
+                continue
                 
-                windowed = chunk * self.window
-                fft = np.fft.rfft(windowed)
-                magnitude = np.abs(fft) / self.fft_size
-                power = 20 * np.log10(magnitude + 1e-12)
-                
-                self.freq_history[self.current_pos] = magnitude[:self.fft_size // 2]
-                self.spec_history[self.current_pos] = power[:self.fft_size // 2]
-                self.current_pos = (self.current_pos + 1) % self.history_size
-                
-                result = {
-                    'spectrum': np.mean(self.freq_history, axis=0),
-                    'spectrogram': np.mean(self.spec_history, axis=0),
-                    'rms': np.sqrt(np.mean(np.square(magnitude))),
-                    'peak': np.max(magnitude)
-                }
-                self.analysis_updated.emit(result)
-            self.mutex.unlock()
-            self.msleep(20)
+            window_from_ring(self.ring, self.read_pos, self.ring_mask, self.window, self.fft_in)
+            # The frame is copied out of the ring, hand the slots back
+            self.read_pos = (self.read_pos + self.fft_size) & self.ring_mask
+            fft = self.fft_plan()
+            magnitude = self.mag_scratch
+            power = self.power_scratch
+            magnitude_and_power(fft, self.inv_fft_size, magnitude, power)
+            
+            # Swap the evicted row out of the running sums and the new one in
+            freq_row = self.freq_history[self.current_pos]
+            spec_row = self.spec_history[self.current_pos]
+            self.freq_sum -= freq_row
+            self.spec_sum -= spec_row
+            freq_row[:] = magnitude
+            spec_row[:] = power
+            self.freq_sum += magnitude
+            self.spec_sum += power
+            self.current_pos = (self.current_pos + 1) % self.history_size
+            if self.current_pos == 0:
+                # Re-sum once per history cycle so float32 rounding can't drift
+                self.freq_history.sum(axis=0, out=self.freq_sum)
+                self.spec_history.sum(axis=0, out=self.spec_sum)
+            
+            # The emitted arrays are fresh each frame: queued slots receive the
+            # same objects, so reused buffers would be overwritten under them
+            self.analysis_updated.emit(AnalysisResult(
+                self.freq_sum * self.inv_history_size,
+                self.spec_sum * self.inv_history_size,
+                float(np.sqrt(magnitude @ magnitude / magnitude.size)),
+                float(magnitude.max())))
             
     def process_audio(self, buffer):
-        audio_data = np.frombuffer(buffer.data(), dtype=np.int16)
-        audio_data = audio_data.astype(np.float32) / 32768.0
+        if self.paused:
+            return
+        raw = np.frombuffer(buffer.data(), dtype=np.int16)
         
-        self.mutex.lock()
-        available_space = len(self.audio_buffer) - self.buffer_pos
-        if len(audio_data) <= available_space:
-            self.audio_buffer[self.buffer_pos:self.buffer_pos+len(audio_data)] = audio_data
-            self.buffer_pos += len(audio_data)
-        self.mutex.unlock()
+        # One slot stays empty so a full ring is distinguishable from an empty one
+        available_space = self.ring_mask - ((self.write_pos - self.read_pos) & self.ring_mask)
+        if raw.size <= available_space:
+            # Scale int16 samples straight into the ring, no intermediate arrays
+            write_to_ring(raw, self.INT16_SCALE, self.ring, self.write_pos, self.ring_mask)
+            end = (self.write_pos + raw.size) & self.ring_mask
+            self.write_pos = end
+            if (end - self.read_pos) & self.ring_mask >= self.fft_size:
+                self.wake_event.set()
+        
+    def pause_analysis(self):
+        self.paused = True
+        
+    def resume_analysis(self):
+        self.paused = False
+        self.wake_event.set()
         
     def stop_analysis(self):
         self.running = False
+        self.wake_event.set()
         self.wait()
 
 class CDRipper(QThread):
@@ -141,6 +246,10 @@ class CDRipper(QThread):
 class LyricsFetcher(QThread):
     lyrics_fetched = pyqtSignal(str, str)  # artist, lyrics
     
+    # Shared by every fetcher so repeat lookups reuse pooled keep-alive connections
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=1))
+    
     def __init__(self, artist, title):
         super().__init__()
         self.artist = artist
@@ -160,73 +269,166 @@ class LyricsFetcher(QThread):
     def search_lyrics_ovh(self, artist, title):
         try:
             url = f"https://api.lyrics.ovh/v1/{artist}/{title}"
-            response = requests.get(url)
-            if response.status_code == 200:
-                return response.json().get('lyrics', '')
-        except:
+            response = self.session.get(url, timeout=LYRICS_TIMEOUT)
+            response.raise_for_status()
+            return response.json().get('lyrics', '')
+        except (requests.RequestException, ValueError):
             pass
         return None
         
     def search_lyrics_az(self, artist, title):
         try:
             search_url = f"https://search.azlyrics.com/search.php?q={artist}+{title}"
-            response = requests.get(search_url)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = self.session.get(search_url, timeout=LYRICS_TIMEOUT)
+            response.raise_for_status()
+            soup = BeautifulSoup(response.content, 'lxml')
             
             # Parse results and get lyrics page
             # This would be more complex in reality
-            lyrics_url = None
-            for link in soup.find_all('a'):
-                if "azlyrics.com/lyrics" in link.get('href', ''):
-                    lyrics_url = link['href']
-                    break
+            link = soup.select_one('a[href*="azlyrics.com/lyrics"]')
+            lyrics_url = link['href'] if link else None
                     
             if lyrics_url:
-                lyrics_response = requests.get(lyrics_url)
-                lyrics_soup = BeautifulSoup(lyrics_response.text, 'html.parser')
-                lyrics_div = lyrics_soup.find('div', class_=None)
+                lyrics_response = self.session.get(lyrics_url, timeout=LYRICS_TIMEOUT)
+                lyrics_response.raise_for_status()
+                lyrics_soup = BeautifulSoup(lyrics_response.content, 'lxml')
+                # The lyrics are the unclassed div that follows the ringtone banner
+                lyrics_div = lyrics_soup.select_one('div.ringtone ~ div:not([class])')
                 if lyrics_div:
                     return lyrics_div.get_text()
-        except:
+        except requests.RequestException:
             pass
         return None
 
 class MediaLibrary:
+    # Columnar store: row i of every column describes the file with id i.
+    # Numeric columns are numpy arrays grown by doubling, so only the first
+    # self.index entries are valid.
+    OBJECT_COLUMNS = ('paths', 'titles', 'artists', 'albums', 'genres', 'lyrics', 'tags', 'last_played')
+    NUMERIC_COLUMNS = {'years': np.int32, 'durations': np.float32, 'bitrates': np.int32,
+                       'play_counts': np.int32, 'ratings': np.int8}
+    
     def __init__(self):
-        self.library = {}  # {id: {path, title, artist, album, year, genre, duration, ...}}
+        # Long-lived I/O pool for tag parsing
+        self.executor = ThreadPoolExecutor(max_workers=METADATA_WORKERS)
+        for name in self.OBJECT_COLUMNS:
+            setattr(self, name, [])
+        for name, dtype in self.NUMERIC_COLUMNS.items():
+            setattr(self, name, np.zeros(0, dtype=dtype))
         self.index = 0
         
+    def __len__(self):
+        return self.index
+        
     def scan_directory(self, directory):
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if any(file.lower().endswith(ext) for ext in SUPPORTED_FORMATS):
-                    path = os.path.join(root, file)
-                    self.add_file(path)
+        paths = list(self.iter_media_files(directory))
+        # Tag parsing is file I/O bound, so read it in parallel and keep
+        # the library inserts on the calling thread
+        for path, metadata in zip(paths, self.executor.map(self.get_metadata, paths)):
+            self.add_file(path, metadata)
+            
+    def iter_media_files(self, directory):
+        # Iterative scandir walk; dirent type info avoids a stat per entry
+        stack = [directory]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                # Unreadable directories are skipped, as os.walk did
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        if os.path.splitext(entry.name)[1].lower() in SUPPORTED_FORMAT_SET:
+                            yield entry.path
                     
-    def add_file(self, path):
+    def add_file(self, path, metadata=None):
         file_id = self.index
+        if metadata is None:
+            metadata = self.get_metadata(path)
+        if file_id == len(self.years):
+            self.grow_columns()
+        
+        self.paths.append(path)
+        # eyed3 reports missing frames as None; keep these columns all str so
+        # they stay sortable
+        self.titles.append(metadata.get('title') or os.path.basename(path))
+        self.artists.append(metadata.get('artist') or 'Unknown')
+        self.albums.append(metadata.get('album') or 'Unknown')
+        self.genres.append(metadata.get('genre', ''))
+        self.lyrics.append(metadata.get('lyrics', ''))
+        self.tags.append(metadata.get('tags', []))
+        self.last_played.append(None)
+        self.years[file_id] = self.parse_year(metadata.get('year', ''))
+        self.durations[file_id] = metadata.get('duration') or 0
+        self.bitrates[file_id] = metadata.get('bitrate') or 0
+        self.play_counts[file_id] = 0
+        self.ratings[file_id] = 0
+        
         self.index += 1
+        return file_id
         
-        metadata = self.get_metadata(path)
-        self.library[file_id] = {
+    def grow_columns(self):
+        capacity = max(64, 2 * len(self.years))
+        for name in self.NUMERIC_COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.index] = column[:self.index]
+            setattr(self, name, grown)
+            
+    def parse_year(self, year):
+        # Tags store dates as text ('2001', '2001-05-02', 'None'); keep the year
+        year = str(year)[:4]
+        return int(year) if year.isdigit() else 0
+        
+    def column(self, name):
+        if name in self.NUMERIC_COLUMNS:
+            return getattr(self, name)[:self.index]
+        return getattr(self, name)
+        
+    def sorted_indices(self, name):
+        # Row ids ordered by a column, for sorting the library views
+        return np.argsort(np.asarray(self.column(name)), kind='stable')
+        
+    def get_row(self, file_id):
+        year = self.years[file_id]
+        return {
             'id': file_id,
-            'path': path,
-            'title': metadata.get('title', os.path.basename(path)),
-            'artist': metadata.get('artist', 'Unknown'),
-            'album': metadata.get('album', 'Unknown'),
-            'year': metadata.get('year', ''),
-            'genre': metadata.get('genre', ''),
-            'duration': metadata.get('duration', 0),
-            'bitrate': metadata.get('bitrate', 0),
-            'last_played': None,
-            'play_count': 0,
-            'rating': 0,
-            'lyrics': metadata.get('lyrics', ''),
-            'tags': metadata.get('tags', [])
+            'path': self.paths[file_id],
+            'title': self.titles[file_id],
+            'artist': self.artists[file_id],
+            'album': self.albums[file_id],
+            'year': str(year) if year else '',
+            'genre': self.genres[file_id],
+            'duration': float(self.durations[file_id]),
+            'bitrate': int(self.bitrates[file_id]),
+            'last_played': self.last_played[file_id],
+            'play_count': int(self.play_counts[file_id]),
+            'rating': int(self.ratings[file_id]),
+            'lyrics': self.lyrics[file_id],
+            'tags': self.tags[file_id]
         }
-        return file_id
         
     def get_metadata(self, path):
+        # Cached per (path, mtime): repeat lookups skip the tag parse and an
+        # edited file misses the cache because its mtime changed
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError as e:
+            print(f"Error reading metadata: {str(e)}")
+            return {}
+        return self.read_metadata(path, mtime)
+        
+    @staticmethod
+    @functools.lru_cache(maxsize=METADATA_CACHE_SIZE)
+    def read_metadata(path, mtime):
+        # Results are shared by every caller, so hand out read-only views
+        return MappingProxyType(MediaLibrary.parse_metadata(path))
+        
+    @staticmethod
+    def parse_metadata(path):
         try:
             if path.lower().endswith('.mp3'):
                 audio = eyed3.load(path)
@@ -239,7 +441,7 @@ class MediaLibrary:
                         'genre': str(audio.tag.genre),
                         'duration': audio.info.time_secs,
                         'bitrate': audio.info.bit_rate[1],
-                        'lyrics': self.get_lyrics(audio)
+                        'lyrics': MediaLibrary.get_lyrics(audio)
                     }
             else:
                 # Handle other formats with mutagen
@@ -259,7 +461,8 @@ class MediaLibrary:
             
         return {}
         
-    def get_lyrics(self, audiofile):
+    @staticmethod
+    def get_lyrics(audiofile):
         try:
             for frame in audiofile.tag.frame_set:
                 if frame.FrameID == 'USLT':
@@ -268,8 +471,14 @@ class MediaLibrary:
             pass
         return ''
 
+## Utility Functions
+def build_media_contents(file_paths):
+    return [QMediaContent(QUrl.fromLocalFile(path)) for path in file_paths]
+
 ## Main Application
 class UltimateMediaPlayer(QMainWindow):
+    playlist_media_ready = pyqtSignal()
+    
     def __init__(self):
         super().__init__()
         
@@ -333,6 +542,11 @@ class UltimateMediaPlayer(QMainWindow):
         # Media library
         self.media_library = MediaLibrary()
         self.library_loaded = False
+        # Playlist media is built on its own small pool so adds never queue
+        # behind a library scan's tag parsing
+        self.playlist_executor = ThreadPoolExecutor(max_workers=PLAYLIST_WORKERS)
+        # (file_paths, future) batches in the order they were requested
+        self.pending_playlist_adds = collections.deque()
         
         # Recording
         self.audio_recorder = QAudioRecorder()
@@ -525,9 +739,10 @@ class UltimateMediaPlayer(QMainWindow):
         
         # Other signals
         self.playlist_widget.itemDoubleClicked.connect(self.play_selected_item)
+        self.playlist_media_ready.connect(self.flush_playlist_adds)
 
     def start_services(self):
-        # Start audio analyzer
+        # Start audio analyzer (paused until playback begins)
         self.audio_analyzer.start()
         
         # Load media library in background
@@ -540,6 +755,10 @@ class UltimateMediaPlayer(QMainWindow):
         # Load all settings...
         self.current_theme = self.settings.value("theme", "Dark")
         self.last_folder = self.settings.value("lastFolder", QStandardPaths.writableLocation(QStandardPaths.MusicLocation))
+        # Bounded deque plus a companion set keeps recent-file adds O(1)
+        self.recent_files = collections.deque(self.settings.value("recentFiles", [], type=list),
+                                              maxlen=MAX_RECENT_FILES)
+        self.recent_files_set = set(self.recent_files)
         
         # Load more settings...
 
@@ -547,6 +766,7 @@ class UltimateMediaPlayer(QMainWindow):
         # Save all settings...
         self.settings.setValue("theme", self.current_theme)
         self.settings.setValue("lastFolder", self.last_folder)
+        self.settings.setValue("recentFiles", list(self.recent_files))
         
         # Save more settings...
 
@@ -569,36 +789,62 @@ class UltimateMediaPlayer(QMainWindow):
         
         if files:
             self.last_folder = os.path.dirname(files[0])
-            for file in files:
-                self.add_to_playlist(file)
+            self.add_to_playlist_bulk(files)
 
     def add_to_playlist(self, file_path):
-        # Add file to both playlist and playlist widget
-        media = QMediaContent(QUrl.fromLocalFile(file_path))
-        self.playlist.addMedia(media)
-        
-        item = QListWidgetItem(os.path.basename(file_path))
-        item.setData(Qt.UserRole, file_path)
-        self.playlist_widget.addItem(item)
+        self.add_to_playlist_bulk([file_path])
+
+    def add_to_playlist_bulk(self, file_paths):
+        # QMediaContent is a reentrant value type, so build it on a worker
+        # thread; the playlist itself is only touched in flush_playlist_adds
+        file_paths = list(file_paths)
+        future = self.playlist_executor.submit(build_media_contents, file_paths)
+        self.pending_playlist_adds.append((file_paths, future))
+        # Normally emitted from a worker thread, so the slot is queued to the UI thread
+        future.add_done_callback(lambda _: self.playlist_media_ready.emit())
+
+    def flush_playlist_adds(self):
+        # Commit finished batches in request order so playlist and widget rows match
+        while self.pending_playlist_adds and self.pending_playlist_adds[0][1].done():
+            file_paths, future = self.pending_playlist_adds.popleft()
+            self.append_to_playlist(file_paths, future.result())
+
+    def append_to_playlist(self, file_paths, contents):
+        # Add files to both playlist and playlist widget with a single
+        # addMedia call and a single repaint for the whole batch
+        self.playlist.addMedia(contents)
         
-        # Add to recent files
-        if file_path not in self.recent_files:
+        self.playlist_widget.setUpdatesEnabled(False)
+        try:
+            for file_path in file_paths:
+                item = QListWidgetItem(os.path.basename(file_path))
+                item.setData(Qt.UserRole, file_path)
+                self.playlist_widget.addItem(item)
+        finally:
+            self.playlist_widget.setUpdatesEnabled(True)
+        
+        for file_path in file_paths:
+            self.add_recent_file(file_path)
+
+    def add_recent_file(self, file_path):
+        if file_path not in self.recent_files_set:
+            if len(self.recent_files) == self.recent_files.maxlen:
+                self.recent_files_set.discard(self.recent_files[0])
             self.recent_files.append(file_path)
-            if len(self.recent_files) > 10:
-                self.recent_files.pop(0)
+            self.recent_files_set.add(file_path)
 
     def play_pause(self):
         if self.media_player.state() == QMediaPlayer.PlayingState:
             self.media_player.pause()
-            self.audio_analyzer.stop_analysis()
+            self.audio_analyzer.pause_analysis()
         else:
             self.media_player.play()
             if not self.video_widget.isVisible():
-                self.audio_analyzer.start()
+                self.audio_analyzer.resume_analysis()
 
     def stop(self):
         self.media_player.stop()
-        self.audio_analyzer.stop_analysis()
+        self.audio_analyzer.pause_analysis()
 
     def previous_track(self):
         self.playlist.previous()
@@ -644,11 +890,11 @@ class UltimateMediaPlayer(QMainWindow):
             self.video_widget.hide()
             self.visualizer.show()
             if self.media_player.state() == QMediaPlayer.PlayingState and not self.media_player.isVideoAvailable():
-                self.audio_analyzer.start()
+                self.audio_analyzer.resume_analysis()
         else:
             self.video_widget.show()
             self.visualizer.hide()
-            self.audio_analyzer.stop_analysis()
+            self.audio_analyzer.pause_analysis()
 
     def set_visualization_mode(self, mode):
         self.current_visualization = mode
@@ -671,21 +917,21 @@ class UltimateMediaPlayer(QMainWindow):
             self.playback_status_label.setText("Playing")
             
             if not self.media_player.isVideoAvailable():
-                self.audio_analyzer.start()
+                self.audio_analyzer.resume_analysis()
         elif state == QMediaPlayer.PausedState:
             self.play_button.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
             self.playback_status_label.setText("Paused")
-            self.audio_analyzer.stop_analysis()
+            self.audio_analyzer.pause_analysis()
         else:  # Stopped
             self.play_button.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
             self.playback_status_label.setText("Stopped")
-            self.audio_analyzer.stop_analysis()
+            self.audio_analyzer.pause_analysis()
 
     def video_availability_changed(self, available):
         if available:
             self.video_widget.show()
             self.visualizer.hide()
-            self.audio_analyzer.stop_analysis()
+            self.audio_analyzer.pause_analysis()
             self.visualizer_button.setChecked(False)
             self.media_type_label.setText("Video")
         else:
@@ -693,7 +939,7 @@ class UltimateMediaPlayer(QMainWindow):
                 self.video_widget.hide()
                 self.visualizer.show()
                 if self.media_player.state() == QMediaPlayer.PlayingState:
-                    self.audio_analyzer.start()
+                    self.audio_analyzer.resume_analysis()
             self.media_type_label.setText("Audio")
 
     def playlist_index_changed(self, index):
@@ -704,18 +950,17 @@ class UltimateMediaPlayer(QMainWindow):
         current_url = media.canonicalUrl()
         if current_url.isLocalFile():
             file_path = current_url.toLocalFile()
-            self.update_current_track_info(file_path)
+            # Read the tags once and share them with the lyrics lookup
+            metadata = self.media_library.get_metadata(file_path)
+            self.update_current_track_info(file_path, metadata)
             
             # Try to load lyrics
-            self.load_lyrics(file_path)
+            self.load_lyrics(file_path, metadata)
             
             # Update status
             self.statusBar().showMessage(f"Now playing: {os.path.basename(file_path)}")
 
-    def update_current_track_info(self, file_path):
-        # Get metadata and update UI
-        metadata = self.media_library.get_metadata(file_path)
-        
+    def update_current_track_info(self, file_path, metadata):
         # Update info labels
         self.track_info_label.setText(f"{metadata.get('artist', 'Unknown')} - {metadata.get('title', os.path.basename(file_path))}")
         self.album_info_label.setText(metadata.get('album', 'Unknown'))
@@ -724,9 +969,8 @@ class UltimateMediaPlayer(QMainWindow):
         if 'bitrate' in metadata:
             self.bitrate_label.setText(f"{metadata['bitrate']} kbps")
 
-    def load_lyrics(self, file_path):
+    def load_lyrics(self, file_path, metadata):
         # Check for embedded lyrics first
-        metadata = self.media_library.get_metadata(file_path)
         embedded_lyrics = metadata.get('lyrics', '')
         
         if embedded_lyrics:
@@ -796,6 +1040,8 @@ class UltimateMediaPlayer(QMainWindow):
         # Clean up resources
         self.audio_analyzer.stop_analysis()
         self.audio_analyzer.quit()
+        self.media_library.executor.shutdown(wait=False)
+        self.playlist_executor.shutdown(wait=False)
         
         if self.lyrics_fetcher:
             self.lyrics_fetcher.terminate()